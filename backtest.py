@@ -0,0 +1,40 @@
+import pandas as pd
+
+
+def find_rank(frame, points):
+    return frame["Rank"].iloc[(frame["Points"] - points).abs().argsort()[0]]
+
+
+def load_realized_scores(path="./mlb_standings.csv", lineups=50):
+    return pd.read_csv(
+        path,
+        header=None,
+        names=["Date", "NumGames", "Overlap"]
+        + [f"Lineup_{n+1}" for n in range(0, lineups)],
+        index_col="Date",
+        parse_dates=True,
+    )
+
+
+def overlap_ranks(realized_scores, dates, standings_dir="./data/mlb_standings"):
+    # For each date, find the contest rank each lineup score would have placed at,
+    # and average the ranks for each overlap setting
+    results_total = []
+    for date in dates:
+        rankings = pd.read_csv(f"{standings_dir}/{date}.csv")
+        date_select = realized_scores.loc[date]
+        results = {}
+        for overlap in date_select["Overlap"].unique():
+            scores = date_select.loc[
+                date_select["Overlap"] == overlap, date_select.columns[2:]
+            ].values.flatten()
+            ranks = [find_rank(rankings, score) for score in scores]
+            results[overlap] = sum(ranks) / len(ranks)
+        results_total.append(results)
+    # Average over all dates that have results for each overlap
+    overlaps = sorted({n for x in results_total for n in x})
+    return {
+        n: sum(x[n] for x in results_total if n in x)
+        / len([x for x in results_total if n in x])
+        for n in overlaps
+    }
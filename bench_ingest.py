@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Throughput and tail latency of the Linestar fetchers under concurrent load.
+# With --local a replay server is started in-process, so nothing leaves the machine;
+# otherwise requests go to LINESTAR_URL.
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def run_bench(get_data, periods, concurrency):
+    def timed(periodId):
+        start = time.perf_counter()
+        try:
+            get_data(periodId)
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return (time.perf_counter() - start, error)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, periods))
+    elapsed = time.perf_counter() - start
+
+    latencies = [x[0] for x in results if x[1] is None]
+    errors = {}
+    for _, error in results:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+    return {"elapsed": elapsed, "latencies": latencies, "errors": errors}
+
+
+def make_parser():
+    from replay_server import make_parser as server_parser
+
+    # Server options are accepted too, and used when --local is given
+    parser = argparse.ArgumentParser(
+        description="Benchmark Linestar ingestion",
+        parents=[server_parser()],
+        add_help=False,
+    )
+    parser.add_argument("--sport", choices=["mlb", "pga"], default="mlb")
+    parser.add_argument("--start", type=int, default=1000, help="First periodId")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--local", action="store_true", help="Start a replay server")
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    if args.local:
+        from replay_server import make_server
+
+        server = make_server(args)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["LINESTAR_URL"] = f"http://{args.host}:{server.server_port}"
+
+    # Imported after LINESTAR_URL is set, since the data modules read it on import
+    if args.sport == "mlb":
+        from mlb_data import get_mlb_data as get_data
+    else:
+        from pga_data import get_pga_data as get_data
+
+    periods = [args.start + i for i in range(args.requests)]
+    stats = run_bench(get_data, periods, args.concurrency)
+    latencies = stats["latencies"]
+    print(f"Requests: {len(periods)} in {stats['elapsed']:.2f}s")
+    print(f"Throughput: {len(periods) / stats['elapsed']:.1f} req/s")
+    if latencies:
+        for q in [0.5, 0.95, 0.99]:
+            print(f"p{int(q * 100)}: {percentile(latencies, q) * 1000:.1f} ms")
+        print(f"max: {max(latencies) * 1000:.1f} ms")
+    for error, count in stats["errors"].items():
+        print(f"{error}: {count}")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+import argparse
+import os
+import sys
+
+# Only lightweight modules are imported here. pandas, requests and the
+# data modules (which read config at import time) are imported inside the
+# subcommand that needs them, so help and status start quickly.
+
+# Exit codes, so schedulers can tell what went wrong
+EXIT_OK = 0
+EXIT_USAGE = 2  # Returned by argparse on bad arguments
+EXIT_NO_DATA = 3
+EXIT_MISSING_FILE = 4
+EXIT_PARTIAL = 5
+
+
+def data_module(sport):
+    if sport == "mlb":
+        import mlb_data
+
+        return mlb_data
+    elif sport == "pga":
+        import pga_data
+
+        return pga_data
+
+
+def salaries_path(sport):
+    return f"./data/{sport}_slates/DKSalaries.csv"
+
+
+def record_games(sport, date, slate):
+    # Keep the game of every player that has been in any version of the slate. Players
+    # scratched after lineups are submitted drop out of updated slates, and late swap
+    # needs to know whether their game has locked.
+    import pandas as pd
+
+    path = f"./data/{sport}_slates/{date}_games.csv"
+    games = slate.dropna(subset=["ID"])[["ID", "Game"]].astype({"ID": "int64"})
+    if os.path.exists(path):
+        games = pd.concat([pd.read_csv(path), games]).drop_duplicates("ID", keep="last")
+    games.to_csv(path, index=False)
+
+
+def match(args, date):
+    import pandas as pd
+
+    path = args.salaries or salaries_path(args.sport)
+    if not os.path.exists(path):
+        print(f"DraftKings salaries not found at {path}", file=sys.stderr)
+        return EXIT_MISSING_FILE
+    ls_slate = pd.read_csv(f"./data/{args.sport}_slates/{date}_linestar.csv")
+    dk = pd.read_csv(path)
+    try:
+        slate = data_module(args.sport).match_dk_salaries(ls_slate, dk)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return EXIT_NO_DATA
+    slate.to_csv(f"./data/{args.sport}_slates/{date}.csv", index=False)
+    print(f"Wrote ./data/{args.sport}_slates/{date}.csv")
+    if "Game" in slate.columns:
+        record_games(args.sport, date, slate)
+    if not args.keep_salaries:
+        os.remove(path)
+    return EXIT_OK
+
+
+def cmd_fetch(args):
+    module = data_module(args.sport)
+    get_proj_slate = getattr(module, f"get_{args.sport}_proj_slate")
+    try:
+        date, ls_slate = get_proj_slate(args.period)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return EXIT_NO_DATA
+    # Keep the raw Linestar slate so DraftKings salaries can be matched again later
+    ls_slate.to_csv(f"./data/{args.sport}_slates/{date}_linestar.csv", index=False)
+    print(f"Wrote ./data/{args.sport}_slates/{date}_linestar.csv")
+    if args.no_match:
+        return EXIT_OK
+    return match(args, date)
+
+
+def cmd_match(args):
+    if not os.path.exists(f"./data/{args.sport}_slates/{args.date}_linestar.csv"):
+        print(f"No fetched Linestar slate for {args.date}", file=sys.stderr)
+        return EXIT_MISSING_FILE
+    return match(args, args.date)
+
+
+def cmd_update(args):
+    from mlb_update import update_mlb_realized_slates, write_mlb_hist
+
+    try:
+        failed = update_mlb_realized_slates(args.seed)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return EXIT_NO_DATA
+    write_mlb_hist()
+    if failed:
+        print(f"Failed periods: {failed}", file=sys.stderr)
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def cmd_backtest(args):
+    from backtest import load_realized_scores, overlap_ranks
+
+    realized_scores = load_realized_scores(args.standings, args.lineups)
+    dates = args.dates or sorted({str(x.date()) for x in realized_scores.index})
+    missing = [x for x in dates if not os.path.exists(f"{args.contests}/{x}.csv")]
+    if missing:
+        print(f"No contest standings for {missing}", file=sys.stderr)
+        return EXIT_MISSING_FILE
+    for overlap, rank in overlap_ranks(realized_scores, dates, args.contests).items():
+        print(f"Overlap {overlap}: average rank {rank:.1f}")
+    return EXIT_OK
+
+
+def cmd_ownership(args):
+    import datetime
+    from periods import load_index
+
+    periods = args.periods
+    if not periods:
+        # Every period in the index that has finished
+        today = str(datetime.date.today())
+        index = load_index(args.sport)
+        periods = sorted(k for k, v in index.items() if (v["date"] or today) < today)
+    if not periods:
+        print(f"No periods to extract for {args.sport}", file=sys.stderr)
+        return EXIT_NO_DATA
+
+    from ownership import extract_ownership
+
+    failed = extract_ownership(args.sport, periods)
+    if failed:
+        print(f"Failed periods: {failed}", file=sys.stderr)
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def cmd_portfolio(args):
+    import pandas as pd
+    from portfolio import (
+        load_portfolio,
+        exposures,
+        overlap_distribution,
+        max_overlaps,
+        stack_counts,
+        leverage,
+    )
+
+    if not os.path.exists(args.lineups):
+        print(f"No lineups at {args.lineups}", file=sys.stderr)
+        return EXIT_MISSING_FILE
+    incidence, player_ids = load_portfolio(args.lineups)
+    print(f"Lineups: {incidence.shape[0]}, players: {len(player_ids)}")
+    print("Overlap distribution:")
+    print(overlap_distribution(incidence).to_string())
+    print("Lineups by largest overlap with another lineup:")
+    largest = pd.Series(max_overlaps(incidence), name="Lineups")
+    print(largest.value_counts().sort_index().rename_axis("Overlap").to_string())
+    if args.slate is None:
+        print("Top exposures:")
+        print(exposures(incidence, player_ids).nlargest(args.top).to_string())
+        return EXIT_OK
+
+    slate = pd.read_csv(args.slate)
+    print("Top exposures:")
+    print(
+        leverage(incidence, player_ids, slate)
+        .nlargest(args.top, "Exposure")
+        .to_string()
+    )
+    if "Team" in slate.columns:
+        print(f"Lineups with {args.stack}+ player team stacks:")
+        print(stack_counts(incidence, player_ids, slate, args.stack).to_string())
+    return EXIT_OK
+
+
+def cmd_record(args):
+    from replay_server import record_payload
+
+    failed = []
+    for periodId in args.periods:
+        try:
+            record_payload(args.sport, periodId, args.payloads)
+            print(f"Recorded {args.sport} period {periodId}")
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            failed.append(periodId)
+    if failed:
+        print(f"Failed periods: {failed}", file=sys.stderr)
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def cmd_status(args):
+    from periods import load_index, pending_ids, latest_fetched
+
+    index = load_index(args.sport)
+    if not index:
+        print(f"No period index for {args.sport}")
+        return EXIT_NO_DATA
+    counts = {}
+    for v in index.values():
+        counts[v["status"]] = counts.get(v["status"], 0) + 1
+    print(f"Periods: {len(index)}")
+    for status, count in sorted(counts.items()):
+        print(f"  {status}: {count}")
+    latest = latest_fetched(index)
+    if latest is not None:
+        print(f"Latest fetched: {latest} ({index[latest]['date']})")
+    pending = pending_ids(index)
+    print(f"Next to fetch: {pending[0] if pending else None}")
+    return EXIT_OK
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="dfs", description="DraftKings DFS data tools"
+    )
+    parser.add_argument(
+        "--base-url", help="Linestar base URL, e.g. a local replay_server.py"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch = subparsers.add_parser(
+        "fetch", help="Fetch Linestar projections and match DraftKings salaries"
+    )
+    fetch.add_argument("sport", choices=["mlb", "pga"])
+    fetch.add_argument("period", type=int, help="Linestar period ID")
+    fetch.add_argument("--salaries", help="Path to DKSalaries.csv")
+    fetch.add_argument(
+        "--no-match", action="store_true", help="Only save the Linestar slate"
+    )
+    fetch.add_argument(
+        "--keep-salaries", action="store_true", help="Don't delete DKSalaries.csv"
+    )
+    fetch.set_defaults(func=cmd_fetch)
+
+    match = subparsers.add_parser(
+        "match", help="Match DraftKings salaries to a fetched Linestar slate"
+    )
+    match.add_argument("sport", choices=["mlb", "pga"])
+    match.add_argument("date", help="Slate date, YYYY-MM-DD")
+    match.add_argument("--salaries", help="Path to DKSalaries.csv")
+    match.add_argument(
+        "--keep-salaries", action="store_true", help="Don't delete DKSalaries.csv"
+    )
+    match.set_defaults(func=cmd_match)
+
+    update = subparsers.add_parser(
+        "update", help="Fetch new realized slates and rebuild the history file"
+    )
+    update.add_argument("sport", choices=["mlb"])
+    update.add_argument(
+        "--seed",
+        type=int,
+        help="Period ID to start the index from, needed when it has no dated periods",
+    )
+    update.set_defaults(func=cmd_update)
+
+    backtest = subparsers.add_parser(
+        "backtest", help="Average contest rank of past lineups for each overlap"
+    )
+    backtest.add_argument("dates", nargs="*", help="Dates to include, default all")
+    backtest.add_argument("--standings", default="./mlb_standings.csv")
+    backtest.add_argument("--contests", default="./data/mlb_standings")
+    backtest.add_argument("--lineups", type=int, default=50)
+    backtest.set_defaults(func=cmd_backtest)
+
+    ownership = subparsers.add_parser(
+        "ownership",
+        help="Extract projected and actual ownership for every contest type",
+    )
+    ownership.add_argument("sport", choices=["mlb", "pga"])
+    ownership.add_argument(
+        "periods", type=int, nargs="*", help="Period IDs, default all in the index"
+    )
+    ownership.set_defaults(func=cmd_ownership)
+
+    portfolio = subparsers.add_parser(
+        "portfolio", help="Exposure, overlap and stack summary of a lineups file"
+    )
+    portfolio.add_argument("lineups", help="Lineups file, e.g. mlb_lineups.csv")
+    portfolio.add_argument("--slate", help="Slate CSV for names, teams and pOwn")
+    portfolio.add_argument("--top", type=int, default=20)
+    portfolio.add_argument("--stack", type=int, default=3, help="Minimum stack size")
+    portfolio.set_defaults(func=cmd_portfolio)
+
+    record = subparsers.add_parser(
+        "record", help="Save Linestar payloads for replay_server.py to serve"
+    )
+    record.add_argument("sport", choices=["mlb", "pga"])
+    record.add_argument("periods", type=int, nargs="+", help="Period IDs")
+    record.add_argument("--payloads", default="./data/replay")
+    record.set_defaults(func=cmd_record)
+
+    status = subparsers.add_parser("status", help="Show the period index for a sport")
+    status.add_argument("sport", choices=["mlb", "pga"])
+    status.set_defaults(func=cmd_status)
+
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    # Data modules read this when they're imported, which happens after this point
+    if args.base_url:
+        os.environ["LINESTAR_URL"] = args.base_url
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
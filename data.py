@@ -3,6 +3,13 @@ import numpy as np
 import requests
 import json
 from difflib import get_close_matches
+import os
+import time
+
+# Point this at a local replay server (see replay_server.py) to run without hitting Linestar
+BASE_URL = os.environ.get("LINESTAR_URL", "https://www.linestarapp.com")
+# Times to retry a throttled request, backing off 1, 2, 4... seconds
+MAX_RETRIES = 4
 
 
 def get_mlb_data(periodId):
@@ -40,12 +47,19 @@ def get_mlb_data(periodId):
         "sport": "3",
     }
 
-    r = requests.get(
-        "https://www.linestarapp.com/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
-        params=params,
-        cookies=cookies,
-        headers=headers,
-    )
+    for attempt in range(MAX_RETRIES + 1):
+        r = requests.get(
+            f"{BASE_URL}/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
+            params=params,
+            cookies=cookies,
+            headers=headers,
+        )
+        if (r.status_code != 429) or (attempt == MAX_RETRIES):
+            break
+        time.sleep(2**attempt)
+    # Report HTTP errors like missing data, so callers skip the period instead of crashing
+    if not r.ok:
+        raise ValueError(f"HTTP {r.status_code} for periodId {periodId}")
     r = r.json()
     # If there are no records, return None
     if len(r["Ownership"]["Salaries"]) == 0:
@@ -247,8 +261,7 @@ def close_matches(x, possible):
         return np.nan
 
 
-if __name__ == "__main__":
-    periodId = int(input("Enter period ID to fetch projections for: "))
+def write_proj_slate(periodId):
     # Get Linestar slate
     date, ls_slate = get_mlb_proj_slate(periodId)
     # Get DraftKings slate, merge it to the linestar slate so we can get DraftKings player IDs
@@ -287,3 +300,19 @@ if __name__ == "__main__":
         raise ValueError("Dropping NaN on slate loses rows.")
 
     slate.to_csv(f"./data/slates/{date}.csv", index=False)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Fetch projections for a period and match them to ./data/slates/DKSalaries.csv"
+    )
+    parser.add_argument("periodId", type=int, help="Linestar period ID")
+    args = parser.parse_args()
+    try:
+        write_proj_slate(args.periodId)
+    except (ValueError, FileNotFoundError, requests.RequestException) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
@@ -4,8 +4,14 @@ import requests
 import json
 from difflib import get_close_matches
 import os
+import time
 from config import cookies, headers
 
+# Point this at a local replay server (see replay_server.py) to run without hitting Linestar
+BASE_URL = os.environ.get("LINESTAR_URL", "https://www.linestarapp.com")
+# Times to retry a throttled request, backing off 1, 2, 4... seconds
+MAX_RETRIES = 4
+
 
 def get_mlb_data(periodId):
     params = {
@@ -14,12 +20,19 @@ def get_mlb_data(periodId):
         "sport": "3",
     }
 
-    r = requests.get(
-        "https://www.linestarapp.com/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
-        params=params,
-        cookies=cookies,
-        headers=headers,
-    )
+    for attempt in range(MAX_RETRIES + 1):
+        r = requests.get(
+            f"{BASE_URL}/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
+            params=params,
+            cookies=cookies,
+            headers=headers,
+        )
+        if (r.status_code != 429) or (attempt == MAX_RETRIES):
+            break
+        time.sleep(2**attempt)
+    # Report HTTP errors like missing data, so callers skip the period instead of crashing
+    if not r.ok:
+        raise ValueError(f"HTTP {r.status_code} for periodId {periodId}")
     r = r.json()
     # If there are no records, return None
     if len(r["Ownership"]["Salaries"]) == 0:
@@ -28,8 +41,10 @@ def get_mlb_data(periodId):
         return r
 
 
-def get_mlb_realized_slate(periodId):
-    data = get_mlb_data(periodId)
+def get_mlb_realized_slate(periodId, data=None):
+    # Callers that already have the payload can pass it to avoid fetching it again
+    if data is None:
+        data = get_mlb_data(periodId)
 
     main_slate = [x for x in data["Ownership"]["Slates"] if x["SlateName"] == "Main"]
     # Raise errors if there are issues with selecting the right slate
@@ -206,12 +221,8 @@ def close_matches(x, possible):
         return np.nan
 
 
-if __name__ == "__main__":
-    periodId = int(input("Enter period ID to fetch projections for: "))
-    # Get Linestar slate
-    date, ls_slate = get_mlb_proj_slate(periodId)
-    # Get DraftKings slate, merge it to the linestar slate so we can get DraftKings player IDs
-    dk = pd.read_csv("./data/mlb_slates/DKSalaries.csv")
+def match_dk_salaries(ls_slate, dk):
+    # Merge DraftKings slate to the linestar slate so we can get DraftKings player IDs
     dk["Name"] = dk["Name"].apply(lambda x: close_matches(x, ls_slate["Name"]))
     slate = ls_slate.merge(
         dk,
@@ -249,5 +260,11 @@ if __name__ == "__main__":
     # slate["ID"] = slate["ID"].replace([np.inf, -np.inf], np.nan)
     # slate = slate.dropna()
     # slate["ID"] = slate["ID"].astype(int)
-    slate.to_csv(f"./data/mlb_slates/{date}.csv", index=False)
-    os.remove("./data/mlb_slates/DKSalaries.csv")
+    return slate
+
+
+if __name__ == "__main__":
+    import sys
+    from cli import main
+
+    sys.exit(main(["fetch", "mlb", *sys.argv[1:]]))
@@ -1,50 +1,133 @@
 import os
+import requests
 from mlb_data import get_mlb_data, get_mlb_realized_slate
-import datetime
+from periods import (
+    load_index,
+    save_index,
+    merge_periods,
+    mark,
+    pending_ids,
+    needs_seed,
+)
+from ownership import ownership_rows, append_ownership
 import pandas as pd
 
-# If we get too far into the future, gonna need to change this value
-# to a more recent one
-data = get_mlb_data(1963)
-ids = {x["StartDate"][:10]: x["Id"] for x in data["Periods"]}
-
-most_recent = datetime.date(1900, 1, 1)
-for file in os.listdir("./data/mlb_realized_slates"):
-    date = datetime.date.fromisoformat(file[:10])
-    if date > most_recent:
-        most_recent = date
-
-most_recent_id = ids[str(most_recent)]
-# Get most recently availiable ID
-max_id = max(ids.values())
-# Start from the ID one past the one we have, and range is not inclusive on the end
-# so we won't get the current projection only ID
-for ID in range(most_recent_id + 1, max_id):
+
+def classify_pending(index, history, start):
+    # Don't refetch periods we already have realized slates for, and don't backfill
+    # periods older than where our history starts
+    for k, v in index.items():
+        if (v["status"] != "pending") or (v["date"] is None):
+            continue
+        if v["date"] in history:
+            mark(index, k, "fetched")
+        elif (start is not None) and (v["date"] < start):
+            mark(index, k, "skipped")
+
+
+def refresh_index(index, refreshed):
+    # Learn about newer periods from the payload of the newest known one. Returns
+    # whether anything was added.
+    newest = max(index)
+    if newest in refreshed:
+        return False
+    refreshed.add(newest)
     try:
-        date, realized_slate = get_mlb_realized_slate(ID)
-        realized_slate.to_csv(f"./data/mlb_realized_slates/{date}.csv", index=False)
-    except ValueError as e:
+        data = get_mlb_data(newest)
+    except (ValueError, requests.RequestException) as e:
         print(e)
+        return False
+    return merge_periods(index, data["Periods"]) > 0
+
+
+def update_mlb_realized_slates(seed=None):
+    index = load_index("mlb")
+    # A seed period is only needed when the index has no dated periods, like the
+    # very first run. Its payload is used to fill in the periods around it.
+    if (seed is not None) and (index.get(seed, {}).get("date") is None):
+        index[seed] = {"date": None, "status": "pending"}
+    if needs_seed(index) and not pending_ids(index):
+        raise ValueError("Period index has no dated periods, pass a seed period ID")
+
+    history = {file[:10] for file in os.listdir("./data/mlb_realized_slates")}
+    # Without any history, start from the seed's date once we know it
+    start = max(history, default=None)
 
-frames = []
-for file in os.listdir("./data/mlb_realized_slates"):
-    data = pd.read_csv(f"./data/mlb_realized_slates/{file}")
-    data["Date"] = file[0:10]
-    frames.append(data)
-
-frame = pd.concat(frames)
-frame = frame[
-    [
-        "Name",
-        "Position",
-        "Salary",
-        "Game",
-        "Team",
-        "Opponent",
-        "Order",
-        "Projection",
-        "Scored",
-        "Date",
+    # Every payload we fetch lists the periods around it, so the index grows as we go
+    # and the next period to fetch is always a local lookup. When nothing is left,
+    # the newest known period is fetched to look for newer ones.
+    failed = []
+    tried = set()
+    refreshed = set()
+    while True:
+        pending = pending_ids(index, tried)
+        if not pending:
+            if not refresh_index(index, refreshed):
+                break
+            classify_pending(index, history, start)
+            save_index("mlb", index)
+            continue
+        ID = pending[0]
+        tried.add(ID)
+        seeding = index[ID]["date"] is None
+        try:
+            data = get_mlb_data(ID)
+            merge_periods(index, data["Periods"])
+            # Its periods are already merged, so it doesn't need a refresh
+            refreshed.add(ID)
+            # Keep ownership for every slate and contest type while we have the payload.
+            # It's written per period, before the index is saved, so the two agree, and
+            # periods without a usable Main slate still contribute their other slates.
+            append_ownership("mlb", ownership_rows(data, ID))
+            date, realized_slate = get_mlb_realized_slate(ID, data)
+            if seeding and (start is not None) and (date <= start):
+                # A seed from inside our history only fills in the index
+                mark(index, ID, "fetched" if date in history else "skipped", date)
+            else:
+                if start is None:
+                    start = date
+                realized_slate.to_csv(
+                    f"./data/mlb_realized_slates/{date}.csv", index=False
+                )
+                mark(index, ID, "fetched", date)
+                history.add(date)
+        except (ValueError, requests.RequestException) as e:
+            print(e)
+            mark(index, ID, "failed")
+            failed.append(ID)
+        classify_pending(index, history, start)
+        save_index("mlb", index)
+    return failed
+
+
+def write_mlb_hist():
+    frames = []
+    for file in os.listdir("./data/mlb_realized_slates"):
+        data = pd.read_csv(f"./data/mlb_realized_slates/{file}")
+        data["Date"] = file[0:10]
+        frames.append(data)
+
+    frame = pd.concat(frames)
+    frame = frame[
+        [
+            "Name",
+            "Position",
+            "Salary",
+            "Game",
+            "Team",
+            "Opponent",
+            "Order",
+            "Projection",
+            "Scored",
+            "Date",
+        ]
     ]
-]
-frame.to_csv("./data/mlb_hist.csv", index=False)
+    frame.to_csv("./data/mlb_hist.csv", index=False)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Optional seed period ID, only needed when the index has no dated periods
+    update_mlb_realized_slates(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    write_mlb_hist()
@@ -0,0 +1,135 @@
+import os
+import pandas as pd
+
+# Projected and actual ownership for every slate and contest type in a Linestar
+# payload, stored as one columnar file per period in ./data/{sport}_ownership/ so
+# ownership models can be fit without fetching anything. The directory reads back
+# as a single table.
+
+KEY = ["Date", "SlateId", "ContestType", "PlayerId"]
+
+
+def table_dir(sport):
+    return f"./data/{sport}_ownership"
+
+
+def period_path(sport, periodId):
+    return f"{table_dir(sport)}/{periodId}.parquet"
+
+
+def stored_periods(sport):
+    path = table_dir(sport)
+    if not os.path.exists(path):
+        return set()
+    return {int(file[:-8]) for file in os.listdir(path) if file.endswith(".parquet")}
+
+
+def ownership_rows(data, periodId):
+    players = {x["PID"]: x for x in data["Ownership"]["Salaries"]}
+    rows = []
+    for slate in data["Ownership"]["Slates"]:
+        # MLB slates list their ID on each game, PGA slates don't have games
+        if slate.get("SlateGames"):
+            slate_id = slate["SlateGames"][0]["SlateId"]
+        else:
+            slate_id = slate["Id"]
+        proj_owned = {
+            x["PlayerId"]: x["Owned"] / 100
+            for x in data["Ownership"]["Projected"].get(str(slate_id), [])
+        }
+        seen_types = set()
+        for contest in data["Ownership"]["ContestResults"]:
+            contest_type = contest["Contest"]["ContestType"]
+            # Only use the first contest of each type, like the realized slates do
+            if (contest["Contest"]["SlateId"] != slate_id) or (
+                contest_type in seen_types
+            ):
+                continue
+            seen_types.add(contest_type)
+            actual_owned = {
+                x["PlayerId"]: x["Owned"] / 100 for x in contest["OwnershipData"]
+            }
+            for player_id in proj_owned.keys() | actual_owned.keys():
+                player = players.get(player_id, {})
+                rows.append(
+                    {
+                        "PeriodId": periodId,
+                        "Date": slate["SlateStart"][0:10],
+                        "SlateId": slate_id,
+                        "SlateName": slate["SlateName"],
+                        "ContestType": contest_type,
+                        "PlayerId": player_id,
+                        "Name": player.get("Name"),
+                        "Position": player.get("POS"),
+                        "Salary": player.get("SAL"),
+                        # Missing ownership means nobody owned them, same as the slates
+                        "pOwn": proj_owned.get(player_id, 0.0),
+                        "actOwn": actual_owned.get(player_id, 0.0),
+                    }
+                )
+    return rows
+
+
+def compact(frame):
+    # Small dtypes keep seasons of data to a few MB
+    return frame.astype(
+        {
+            "PeriodId": "int32",
+            "SlateId": "int32",
+            "SlateName": "category",
+            "ContestType": "int8",
+            "PlayerId": "int32",
+            "Position": "category",
+            "Salary": "float32",
+            "pOwn": "float32",
+            "actOwn": "float32",
+        }
+    )
+
+
+def load_ownership(sport):
+    if not stored_periods(sport):
+        return None
+    # Categories are encoded per file, so re-encode them over the whole table
+    frame = pd.read_parquet(table_dir(sport))
+    frame = compact(frame.astype({"SlateName": "object", "Position": "object"}))
+    return frame.sort_values(KEY).reset_index(drop=True)
+
+
+def append_ownership(sport, rows):
+    if not rows:
+        return
+    frame = compact(pd.DataFrame(rows))
+    os.makedirs(table_dir(sport), exist_ok=True)
+    # Each period gets its own file, so appending never rewrites earlier periods and
+    # newly extracted rows replace any already stored for the same period
+    for periodId, period in frame.groupby("PeriodId"):
+        # Write to a hidden temporary file first so an interrupted write can't leave a
+        # partial period. Hidden files aren't read as part of the table.
+        tmp = f"{table_dir(sport)}/.{periodId}.parquet.tmp"
+        period.sort_values(KEY).to_parquet(tmp, index=False)
+        os.replace(tmp, period_path(sport, periodId))
+
+
+def extract_ownership(sport, periods):
+    import requests
+
+    if sport == "mlb":
+        from mlb_data import get_mlb_data as get_data
+    else:
+        from pga_data import get_pga_data as get_data
+
+    done = stored_periods(sport)
+    failed = []
+    for periodId in periods:
+        if periodId in done:
+            continue
+        try:
+            data = get_data(periodId)
+        except (ValueError, requests.RequestException) as e:
+            print(e)
+            failed.append(periodId)
+            continue
+        # Write each period as it's extracted so an interrupted backfill keeps its progress
+        append_ownership(sport, ownership_rows(data, periodId))
+    return failed
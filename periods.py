@@ -0,0 +1,87 @@
+import json
+import os
+import datetime
+
+# Each sport keeps an index of Linestar periods at ./data/{sport}_periods.json
+# mapping periodId to the slate date and the fetch status of its realized slate.
+# Status is one of "pending", "fetched", "failed", or "skipped". Failed periods
+# are retried on later updates until they have failed MAX_ATTEMPTS times.
+
+MAX_ATTEMPTS = 3
+
+
+def index_path(sport):
+    return f"./data/{sport}_periods.json"
+
+
+def load_index(sport):
+    path = index_path(sport)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        index = json.load(f)
+    # JSON keys are always strings, so convert periodIds back to integers
+    return {int(k): v for k, v in index.items()}
+
+
+def save_index(sport, index):
+    path = index_path(sport)
+    # Write to a temporary file first so an interrupted update can't corrupt the index
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({str(k): index[k] for k in sorted(index)}, f, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def merge_periods(index, periods):
+    # Every GetSalariesV5 payload lists recent periods, so merge any we haven't
+    # seen yet. Existing entries keep their fetch status.
+    added = 0
+    for period in periods:
+        if period["Id"] not in index:
+            index[period["Id"]] = {
+                "date": period["StartDate"][:10],
+                "status": "pending",
+            }
+            added += 1
+    return added
+
+
+def mark(index, periodId, status, date=None):
+    entry = index.setdefault(periodId, {"date": date, "status": status})
+    entry["status"] = status
+    if status == "failed":
+        entry["attempts"] = entry.get("attempts", 0) + 1
+    if date is not None:
+        entry["date"] = date
+
+
+def retryable(entry):
+    return (entry["status"] == "pending") or (
+        (entry["status"] == "failed") & (entry.get("attempts", 0) < MAX_ATTEMPTS)
+    )
+
+
+def pending_ids(index, tried=()):
+    # Periods from today onward only have projections, so they aren't fetchable yet.
+    # A seeded period with no known date is always fetched so we can learn it.
+    # Periods already tried during this update are left for the next one.
+    today = str(datetime.date.today())
+    return sorted(
+        k
+        for k, v in index.items()
+        if retryable(v)
+        & (k not in tried)
+        & ((v["date"] is None) or (v["date"] < today))
+    )
+
+
+def needs_seed(index):
+    # Without any dated period the index can't grow, e.g. if the seed fetch failed
+    return all(v["date"] is None for v in index.values())
+
+
+def latest_fetched(index):
+    fetched = [k for k, v in index.items() if v["status"] == "fetched"]
+    if not fetched:
+        return None
+    return max(fetched)
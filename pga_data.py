@@ -3,8 +3,14 @@ import numpy as np
 import requests
 from difflib import get_close_matches
 import os
+import time
 from config import cookies, headers
 
+# Point this at a local replay server (see replay_server.py) to run without hitting Linestar
+BASE_URL = os.environ.get("LINESTAR_URL", "https://www.linestarapp.com")
+# Times to retry a throttled request, backing off 1, 2, 4... seconds
+MAX_RETRIES = 4
+
 
 def get_pga_data(periodId):
     params = {
@@ -13,12 +19,19 @@ def get_pga_data(periodId):
         "sport": "5",
     }
 
-    r = requests.get(
-        "https://www.linestarapp.com/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
-        params=params,
-        cookies=cookies,
-        headers=headers,
-    )
+    for attempt in range(MAX_RETRIES + 1):
+        r = requests.get(
+            f"{BASE_URL}/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5",
+            params=params,
+            cookies=cookies,
+            headers=headers,
+        )
+        if (r.status_code != 429) or (attempt == MAX_RETRIES):
+            break
+        time.sleep(2**attempt)
+    # Report HTTP errors like missing data, so callers skip the period instead of crashing
+    if not r.ok:
+        raise ValueError(f"HTTP {r.status_code} for periodId {periodId}")
     r = r.json()
     # If there are no records, return None
     if len(r["Ownership"]["Salaries"]) == 0:
@@ -158,12 +171,8 @@ def close_matches(x, possible):
         return np.nan
 
 
-if __name__ == "__main__":
-    periodId = int(input("Enter period ID to fetch projections for: "))
-    # Get Linestar slate
-    date, ls_slate = get_pga_proj_slate(periodId)
-    # Get DraftKings slate, merge it to the linestar slate so we can get DraftKings player IDs
-    dk = pd.read_csv("./data/pga_slates/DKSalaries.csv")
+def match_dk_salaries(ls_slate, dk):
+    # Merge DraftKings slate to the linestar slate so we can get DraftKings player IDs
     dk["Name"] = dk["Name"].apply(lambda x: close_matches(x, ls_slate["Name"]))
     slate = ls_slate.merge(
         dk,
@@ -183,6 +192,11 @@ if __name__ == "__main__":
         )
 
     # Just drop any mysterious NA rows and hope for the best
-    slate = slate.dropna()
-    slate.to_csv(f"./data/pga_slates/{date}.csv", index=False)
-    os.remove("./data/pga_slates/DKSalaries.csv")
+    return slate.dropna()
+
+
+if __name__ == "__main__":
+    import sys
+    from cli import main
+
+    sys.exit(main(["fetch", "pga", *sys.argv[1:]]))
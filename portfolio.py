@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Analytics for a portfolio of lineups, like the *_lineups.csv files written by
+# write_lineups. A portfolio is held as a sparse lineup x player incidence matrix
+# so everything below is a sparse product or reduction, and stays fast for
+# thousands of lineups.
+
+
+def load_portfolio(path):
+    # Every column is a DraftKings player ID, the header is just roster positions
+    lineups = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.int64, ndmin=2)
+    player_ids, cols = np.unique(lineups, return_inverse=True)
+    rows = np.repeat(np.arange(lineups.shape[0]), lineups.shape[1])
+    incidence = sparse.csr_matrix(
+        (np.ones(lineups.size, dtype=np.int32), (rows, cols.ravel())),
+        shape=(lineups.shape[0], len(player_ids)),
+    )
+    return (incidence, player_ids)
+
+
+def exposures(incidence, player_ids):
+    # Fraction of lineups each player appears in
+    counts = np.asarray(incidence.sum(axis=0)).ravel()
+    return pd.Series(counts / incidence.shape[0], index=player_ids, name="Exposure")
+
+
+def overlap_matrix(incidence):
+    # Entry (i, j) is the number of players lineups i and j share, and the diagonal is
+    # roster size. This is what the optimizer's overlap constraint bounds.
+    return incidence @ incidence.T
+
+
+def overlap_distribution(incidence):
+    # Number of lineup pairs sharing each number of players
+    overlaps = sparse.triu(overlap_matrix(incidence), k=1).tocoo()
+    n = incidence.shape[0]
+    roster_size = incidence[0].sum() if n > 0 else 0
+    counts = np.bincount(overlaps.data, minlength=roster_size + 1)
+    # Pairs that share no players aren't stored in the sparse product
+    counts[0] = n * (n - 1) // 2 - len(overlaps.data)
+    return pd.Series(counts, name="Pairs").rename_axis("Overlap")
+
+
+def max_overlaps(incidence):
+    # Largest overlap each lineup has with any other lineup in the portfolio
+    overlaps = overlap_matrix(incidence).tolil()
+    # Drop the diagonal, every lineup fully overlaps itself
+    overlaps.setdiag(0)
+    return overlaps.tocsr().max(axis=1).toarray().ravel()
+
+
+def index_slate(slate, player_ids):
+    # Slates can have players whose DraftKings ID didn't match, so their ID is NaN.
+    # They can't be in a lineup, and duplicate NaN labels would break reindexing.
+    slate = slate.dropna(subset=["ID"]).astype({"ID": "int64"})
+    return slate.set_index("ID").reindex(player_ids)
+
+
+def team_matrix(player_ids, slate, exclude=("P",)):
+    # Player x team incidence, leaving out positions that don't count towards stacks
+    slate = index_slate(slate, player_ids)
+    eligible = slate["Team"].notna() & ~slate["Position"].isin(exclude)
+    teams, team_index = np.unique(slate.loc[eligible, "Team"], return_inverse=True)
+    rows = np.flatnonzero(eligible.values)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, team_index)),
+        shape=(len(player_ids), len(teams)),
+    )
+    return (matrix, teams)
+
+
+def stack_sizes(incidence, player_ids, slate, exclude=("P",)):
+    # Lineup x team matrix counting how many players each lineup takes from each team
+    matrix, teams = team_matrix(player_ids, slate, exclude)
+    return pd.DataFrame((incidence @ matrix).toarray(), columns=teams)
+
+
+def stack_counts(incidence, player_ids, slate, min_size=3, exclude=("P",)):
+    # Number of lineups stacking at least min_size players from each team
+    sizes = stack_sizes(incidence, player_ids, slate, exclude)
+    counts = (sizes >= min_size).sum(axis=0)
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+def leverage(incidence, player_ids, slate):
+    # Compare our exposure to projected ownership. pOwn is a fraction like exposure.
+    frame = index_slate(slate, player_ids)[["Name", "pOwn"]]
+    frame["Exposure"] = exposures(incidence, player_ids)
+    frame["Leverage"] = frame["Exposure"] - frame["pOwn"]
+    frame["Ratio"] = frame["Exposure"] / frame["pOwn"].replace(0, np.nan)
+    return frame.sort_values("Leverage", ascending=False)
@@ -0,0 +1,207 @@
+import argparse
+import collections
+import json
+import os
+import random
+import threading
+import time
+import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for Linestar's GetSalariesV5 endpoint, for load testing the
+# ingestion path without hitting the real site. Run it, then set
+# LINESTAR_URL=http://localhost:8765 (or pass --base-url to cli.py).
+#
+# Recorded payloads are served from {payloads}/{sport}/{periodId}.json, where sport
+# is Linestar's sport number (3 is MLB, 5 is PGA). Periods without a recording get
+# a synthetic payload with the same shape, seeded by periodId so it's stable.
+# Record real payloads with `python cli.py record mlb <periodId>...`.
+
+PATH = "/DesktopModules/DailyFantasyApi/API/Fantasy/GetSalariesV5"
+MLB_POSITIONS = ["SP", "SP", "C", "1B", "2B", "3B", "SS", "OF", "OF", "OF"]
+
+
+def synthetic_payload(periodId, sport, players):
+    rng = random.Random(periodId * 10 + sport)
+    date = datetime.date(2022, 1, 1) + datetime.timedelta(days=periodId % 365)
+    slate_id = periodId * 100
+    games = list(range(periodId * 1000, periodId * 1000 + max(players // 20, 1)))
+
+    salaries = []
+    for i in range(players):
+        game = games[i % len(games)]
+        if sport == 3:
+            position = MLB_POSITIONS[i % len(MLB_POSITIONS)]
+            order = 0 if position == "SP" else 31 + (i % 9)
+        else:
+            position = "G"
+            order = 0
+        team = f"T{(game % 1000) * 2 + i % 2}"
+        opponent = f"T{(game % 1000) * 2 + 1 - i % 2}"
+        projection = round(rng.uniform(1, 25), 2)
+        salaries.append(
+            {
+                "PID": periodId * 10000 + i,
+                "Name": f"Player {periodId}-{i}",
+                "POS": position,
+                "SAL": rng.randrange(2000, 12000, 100),
+                "GI": f"{opponent}@{team} 07:05PM",
+                "GID": game,
+                "PTEAM": team,
+                "OTEAM": opponent,
+                "PP": projection,
+                "AggProj": projection,
+                "PS": round(rng.gauss(projection, 6), 2),
+                "Notes": json.dumps([{"Alert": order}] if order else []),
+            }
+        )
+    ownership = [
+        {"PlayerId": x["PID"], "Owned": round(rng.uniform(0, 40), 1)} for x in salaries
+    ]
+    return {
+        "Periods": [
+            {
+                "Id": x,
+                "StartDate": str(date + datetime.timedelta(days=x - periodId))
+                + "T00:00:00",
+            }
+            for x in range(periodId - 5, periodId + 2)
+        ],
+        "Ownership": {
+            "Salaries": salaries,
+            "Slates": [
+                {
+                    "Id": slate_id,
+                    "SlateName": "Main",
+                    "SlateStart": f"{date}T19:05:00",
+                    "SlateGames": [{"SlateId": slate_id, "GameId": x} for x in games],
+                }
+            ],
+            "Projected": {str(slate_id): ownership},
+            "ContestResults": [
+                {
+                    "Contest": {"SlateId": slate_id, "ContestType": 4},
+                    "OwnershipData": [
+                        {
+                            "PlayerId": x["PlayerId"],
+                            "Owned": round(rng.uniform(0, 40), 1),
+                        }
+                        for x in ownership
+                    ],
+                }
+            ],
+        },
+    }
+
+
+class RateLimiter:
+    # Sliding one second window; requests over the limit get a 429
+    def __init__(self, per_second):
+        self.per_second = per_second
+        self.times = collections.deque()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if not self.per_second:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            while self.times and (now - self.times[0] > 1):
+                self.times.popleft()
+            if len(self.times) >= self.per_second:
+                return False
+            self.times.append(now)
+            return True
+
+
+def make_handler(options):
+    limiter = RateLimiter(options.rate_limit)
+    # Synthetic payloads are cached since they're deterministic per period anyway
+    cache = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, code, body):
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != PATH:
+                return self.send_json(404, b'{"Message": "Not found"}')
+            query = parse_qs(url.query)
+            try:
+                periodId = int(query["periodId"][0])
+                sport = int(query["sport"][0])
+            except (KeyError, ValueError):
+                return self.send_json(400, b'{"Message": "Bad periodId or sport"}')
+
+            if not limiter.allow():
+                return self.send_json(429, b'{"Message": "Too many requests"}')
+            time.sleep((options.latency + random.uniform(0, options.jitter)) / 1000)
+            if random.random() < options.error_rate:
+                return self.send_json(500, b'{"Message": "Injected error"}')
+
+            key = (sport, periodId)
+            if key not in cache:
+                path = f"{options.payloads}/{sport}/{periodId}.json"
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        cache[key] = f.read()
+                else:
+                    cache[key] = json.dumps(
+                        synthetic_payload(periodId, sport, options.players)
+                    ).encode()
+            self.send_json(200, cache[key])
+
+        def log_message(self, format, *args):
+            if options.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def make_server(options):
+    return ThreadingHTTPServer((options.host, options.port), make_handler(options))
+
+
+def record_payload(sport, periodId, payloads="./data/replay"):
+    # Save a real payload so the replay server can serve it later
+    if sport == "mlb":
+        from mlb_data import get_mlb_data as get_data
+
+        number = 3
+    else:
+        from pga_data import get_pga_data as get_data
+
+        number = 5
+    os.makedirs(f"{payloads}/{number}", exist_ok=True)
+    with open(f"{payloads}/{number}/{periodId}.json", "w") as f:
+        json.dump(get_data(periodId), f)
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Local Linestar replay server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--payloads", default="./data/replay")
+    parser.add_argument("--players", type=int, default=300, help="Synthetic slate size")
+    parser.add_argument("--latency", type=float, default=0, help="Base latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Extra random ms")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests/sec, 0 off")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of 500s")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+if __name__ == "__main__":
+    options = make_parser().parse_args()
+    server = make_server(options)
+    print(f"Serving on http://{options.host}:{options.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
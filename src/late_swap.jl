@@ -0,0 +1,184 @@
+using LinearAlgebra
+include("types.jl")
+include("optim.jl")
+
+
+"""
+    read_lineups(path::AbstractString)
+
+Reads a lineups file in the format written by write_lineups.
+Returns the roster position header and a vector of DraftKings player IDs for each lineup.
+"""
+function read_lineups(path::AbstractString)
+    lines = readlines(path)
+    header = String.(split(lines[1], ","))
+    lineups = [parse.(Int, split(line, ",")) for line in lines[2:end] if !isempty(line)]
+    return (header, lineups)
+end
+
+
+# Positions that can fill the NFL FLEX slot
+const FLEX_POSITIONS = ["RB", "WR", "TE"]
+
+
+"""
+    player_games(slate::Slate, submitted_players::AbstractVector)
+
+Maps DraftKings player IDs to their Game, from the updated slate and `submitted_players`, rows
+with the ID and Game of players from earlier versions of the slate, like the {date}_games.csv
+file cli.py match writes. Players scratched since submission drop out of the updated slate,
+so the earlier rows are needed to know which game they were in.
+"""
+function player_games(slate::Slate, submitted_players::AbstractVector)
+    games = Dict{Int64,String}(player.ID => player.Game for player in submitted_players)
+    for player in slate.players
+        games[player.ID] = player.Game
+    end
+    return games
+end
+
+
+"""
+    lineup_vector(slate::Slate, ids::AbstractVector{<:Integer})
+
+Transforms a vector of DraftKings player IDs into a lineup vector like those from optimization.
+Players that aren't in the slate are left out, so their roster slot is open to swap.
+"""
+function lineup_vector(slate::Slate, ids::AbstractVector{<:Integer})
+    index = Dict(player.ID => i for (i, player) in enumerate(slate.players))
+    lineup = zeros(Int, length(slate.players))
+    for id in ids
+        if haskey(index, id)
+            lineup[index[id]] = 1
+        end
+    end
+    return lineup
+end
+
+
+"""
+    open_slots(slate::Slate, header::AbstractVector{<:AbstractString}, ids::AbstractVector{<:Integer}, games::AbstractDict{<:Integer,<:AbstractString}, locked_games::AbstractVector{<:AbstractString})
+
+Finds how many players of each position can be added to fill a lineup's unlocked roster slots.
+Returns a dict mapping position to (minimum, maximum) number of new players.
+An open FLEX slot lets one more RB, WR or TE in.
+"""
+function open_slots(slate::Slate, header::AbstractVector{<:AbstractString}, ids::AbstractVector{<:Integer}, games::AbstractDict{<:Integer,<:AbstractString}, locked_games::AbstractVector{<:AbstractString})
+    counts = Dict{String,Int}()
+    for (k, id) in enumerate(ids)
+        if !(games[id] in locked_games)
+            counts[header[k]] = get(counts, header[k], 0) + 1
+        end
+    end
+    flex = get(counts, "FLEX", 0)
+    slots = Dict{String,Tuple{Int,Int}}()
+    for position in keys(slate.positions)
+        if position == "FLEX"
+            continue
+        end
+        n = get(counts, position, 0)
+        slots[position] = position in FLEX_POSITIONS ? (n, n + flex) : (n, n)
+    end
+    return slots
+end
+
+
+"""
+    late_swap(data::Union{MLBTournyOptimData,NFLTournyOptimData}, header::AbstractVector{<:AbstractString}, submitted::AbstractVector{<:AbstractVector{<:Integer}}, locked_games::AbstractVector{<:AbstractString}; submitted_players::AbstractVector=NamedTuple[])
+
+Re-optimizes the unlocked roster slots of every lineup in a submitted portfolio, given as
+DraftKings player IDs in the roster slot order of `header`, as returned by read_lineups.
+Players in locked games are fixed, so locked players stay and no new ones from those games can be added.
+New players are limited to the positions of the open roster slots.
+Submitted players missing from the updated slate, like scratched batters, are swapped out if their
+game hasn't locked. Their game is found from `submitted_players`, as in player_games.
+Each lineup keeps the overlap constraint against every other lineup in the portfolio.
+"""
+function late_swap(data::Union{MLBTournyOptimData,NFLTournyOptimData}, header::AbstractVector{<:AbstractString}, submitted::AbstractVector{<:AbstractVector{<:Integer}}, locked_games::AbstractVector{<:AbstractString}; submitted_players::AbstractVector=NamedTuple[])
+    p = length(data.slate.players)
+    N = length(submitted)
+    roster_size = sum(values(data.slate.positions))
+    slate_ids = Set(player.ID for player in data.slate.players)
+    games = player_games(data.slate, submitted_players)
+    for ids in submitted, id in ids
+        if !haskey(games, id)
+            error("Player $(id) isn't in the slate or submitted players, so we can't tell if their game has locked")
+        elseif !(id in slate_ids) && (games[id] in locked_games)
+            # The model can't keep a player it doesn't know about
+            error("Locked player $(id) is missing from the updated slate")
+        end
+    end
+    lineups = [lineup_vector(data.slate, ids) for ids in submitted]
+    slots = [open_slots(data.slate, header, ids, games, locked_games) for ids in submitted]
+    locked = [i for i = 1:p if data.slate.players[i].Game in locked_games]
+    fixed = [Dict(i => lineup[i] for i in locked) for lineup in lineups]
+
+    swapped = Vector{Vector{Int64}}(undef, N)
+    # Lineups are independent given the submitted portfolio, so swap them all in parallel
+    Threads.@threads for n in 1:N
+        if sum(lineups[n][i] for i in locked; init=0) == roster_size
+            # Every player is locked, nothing to swap
+            swapped[n] = lineups[n]
+        else
+            swapped[n] = lambda_max(data, lineups[[1:n-1; n+1:N]]; fixed=fixed[n], open_slots=slots[n])
+        end
+    end
+
+    # Lineups swapped at the same time can pick the same new players and overlap too much
+    # with each other, so re-solve those one at a time against the swapped portfolio
+    for n in 1:N
+        others = swapped[[1:n-1; n+1:N]]
+        if any(dot(swapped[n], other) > data.overlap for other in others)
+            println("Re-solving lineup $(n) for overlap")
+            swapped[n] = lambda_max(data, others; fixed=fixed[n], open_slots=slots[n])
+        end
+    end
+    return swapped
+end
+
+
+"""
+    assign_slots(slate::Slate, header::AbstractVector{<:AbstractString}, submitted::AbstractVector{<:Integer}, lineup::AbstractVector{<:Integer}, games::AbstractDict{<:Integer,<:AbstractString}, locked_games::AbstractVector{<:AbstractString})
+
+Maps a swapped lineup vector to DraftKings player IDs in roster slot order.
+Locked players have to stay in the slot they were submitted in, so they keep it and
+new players fill the remaining slots, with FLEX filled last.
+"""
+function assign_slots(slate::Slate, header::AbstractVector{<:AbstractString}, submitted::AbstractVector{<:Integer}, lineup::AbstractVector{<:Integer}, games::AbstractDict{<:Integer,<:AbstractString}, locked_games::AbstractVector{<:AbstractString})
+    ids = Vector{Union{Int64,Missing}}(missing, length(header))
+    for (k, id) in enumerate(submitted)
+        if games[id] in locked_games
+            ids[k] = id
+        end
+    end
+
+    new_players = [i for i in findall(==(1), lineup) if !(slate.players[i].Game in locked_games)]
+    for k in [findall(!=("FLEX"), header); findall(==("FLEX"), header)]
+        if !ismissing(ids[k])
+            continue
+        end
+        eligible = header[k] == "FLEX" ? FLEX_POSITIONS : [header[k]]
+        j = findfirst(i -> slate.players[i].Position in eligible, new_players)
+        if isnothing(j)
+            error("No player to fill $(header[k]) slot")
+        end
+        ids[k] = slate.players[new_players[j]].ID
+        deleteat!(new_players, j)
+    end
+    return ids
+end
+
+
+"""
+    write_swapped_lineups(path::AbstractString, header::AbstractVector{<:AbstractString}, lineups::AbstractVector{<:AbstractVector})
+
+Writes lineups of DraftKings player IDs, already in roster slot order, to a CSV file
+"""
+function write_swapped_lineups(path::AbstractString, header::AbstractVector{<:AbstractString}, lineups::AbstractVector{<:AbstractVector})
+    open(path, "w") do file
+        println(file, join(header, ","))
+        for lineup in lineups
+            println(file, join(lineup, ","))
+        end
+    end
+end
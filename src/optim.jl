@@ -6,16 +6,37 @@ include("payoffs.jl")
 
 
 """
-    do_optim(data::MLBTournyOptimData)
+    constrain_open_slots!(model::Model, x::AbstractVector{VariableRef}, slate::Slate, fixed::AbstractDict{<:Integer,<:Integer}, open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}})
 
-Runs optimization for tournaments
+Bounds the number of selected players of each position among those that aren't fixed.
+Used in late swap so new players can actually fill the roster slots that are still open.
 """
-function do_optim(data::MLBTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}})
+function constrain_open_slots!(model::Model, x::AbstractVector{VariableRef}, slate::Slate, fixed::AbstractDict{<:Integer,<:Integer}, open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}})
+    p = length(slate.players)
+    for (position, (lower, upper)) in open_slots
+        selected = sum(x[i] for i = 1:p if !haskey(fixed, i) && (slate.players[i].Position == position); init=AffExpr(0.0))
+        @constraint(model, lower <= selected <= upper)
+    end
+end
+
+
+"""
+    do_optim(data::MLBTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}(), open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}}=Dict{String,Tuple{Int,Int}}())
+
+Runs optimization for tournaments. Players in `fixed` have their selection fixed to the given 0 or 1 value.
+`open_slots` bounds how many players of each position can be selected from the players that aren't fixed.
+"""
+function do_optim(data::MLBTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}(), open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}}=Dict{String,Tuple{Int,Int}}())
     model = Model(Xpress.Optimizer)
 
     p = length(data.slate.players)
     # Players variable
     @variable(model, x[1:p], binary = true)
+    # Fix players whose selection can't change, like those in games that have already locked
+    for (i, v) in fixed
+        fix(x[i], v; force=true)
+    end
+    constrain_open_slots!(model, x, data.slate, fixed, open_slots)
     # Games variable
     @variable(model, g[data.slate.games], binary = true)
 
@@ -65,16 +86,20 @@ end
 
 
 """
-    do_optim(data::PGATournyOptimData)
+    do_optim(data::PGATournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}())
 
-Runs optimization for tournaments
+Runs optimization for tournaments. Players in `fixed` have their selection fixed to the given 0 or 1 value.
 """
-function do_optim(data::PGATournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}})
+function do_optim(data::PGATournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}())
     model = Model(Xpress.Optimizer)
 
     p = length(data.slate.players)
     # Players variable
     @variable(model, x[1:p], binary = true)
+    # Fix players whose selection can't change, like those in games that have already locked
+    for (i, v) in fixed
+        fix(x[i], v; force=true)
+    end
 
     # Total salary must be <= $50,000
     @constraint(model, sum(data.slate.players[i].Salary * x[i] for i = 1:p) <= 50000)
@@ -100,16 +125,22 @@ end
 
 
 """
-    do_optim(data::NFLTournyOptimData)
+    do_optim(data::NFLTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}(), open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}}=Dict{String,Tuple{Int,Int}}())
 
-Runs optimization for tournaments
+Runs optimization for tournaments. Players in `fixed` have their selection fixed to the given 0 or 1 value.
+`open_slots` bounds how many players of each position can be selected from the players that aren't fixed.
 """
-function do_optim(data::NFLTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}})
+function do_optim(data::NFLTournyOptimData, λ::Real, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; fixed::AbstractDict{<:Integer,<:Integer}=Dict{Int,Int}(), open_slots::AbstractDict{<:AbstractString,<:Tuple{Integer,Integer}}=Dict{String,Tuple{Int,Int}}())
     model = Model(Xpress.Optimizer)
 
     p = length(data.slate.players)
     # Players variable
     @variable(model, x[1:p], binary = true)
+    # Fix players whose selection can't change, like those in games that have already locked
+    for (i, v) in fixed
+        fix(x[i], v; force=true)
+    end
+    constrain_open_slots!(model, x, data.slate, fixed, open_slots)
     # Games variable
     @variable(model, g[data.slate.games], binary = true)
 
@@ -152,17 +183,18 @@ end
 
 
 """
-    lambda_max(data::TournyOptimData, past_lineups::AbstractVector{<:AbstractVector{<:Integer}})
+    lambda_max(data::TournyOptimData, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; kwargs...)
 
 Does optimization over range of λ values and returns the lineup with the highest objective function.
+Keyword arguments are passed on to do_optim.
 """
-function lambda_max(data::TournyOptimData, past_lineups::AbstractVector{<:AbstractVector{<:Integer}})
+function lambda_max(data::TournyOptimData, past_lineups::AbstractVector{<:AbstractVector{<:Integer}}; kwargs...)
     # I've found that lambdas from around 0 to 0.05 are selected, with most being 0.03
     lambdas = 0.01:0.01:0.08
     w_star = Vector{Tuple{Vector{Int64},Float64}}(undef, length(lambdas))
     # Perform optimization over array of λ values
     Threads.@threads for i in 1:length(lambdas)
-        w_star[i] = do_optim(data, lambdas[i], past_lineups)
+        w_star[i] = do_optim(data, lambdas[i], past_lineups; kwargs...)
     end
 
     # Find lambda value that leads to highest objective function and return its corresponding lineup vector
@@ -0,0 +1,53 @@
+using Dates
+include("optim.jl")
+include("types.jl")
+include("io.jl")
+include("opp_teams.jl")
+include("late_swap.jl")
+
+println("Getting slate")
+# SET PARAMETER: slate date, using a slate file with updated projections
+slate = get_mlb_slate("2022-09-06")
+# Games of every player from any version of the slate, written by cli.py match. Players
+# scratched since the lineups were submitted are dropped from the updated slate, so this
+# is where their games come from.
+submitted_players = CSV.read("./data/mlb_slates/2022-09-06_games.csv", Tables.rowtable)
+# SET PARAMETER: games that have already locked, as in the slate's Game column
+locked_games = ["NYY@MIN", "TB@TOR"]
+# SET PARAMETER: payoffs
+# 15k
+payoffs = Tuple{Int64,Float64}[
+    (1, 1500.0),
+    (2, 750.0),
+    (3, 300.0),
+    (4, 150.0),
+    (5, 100.0),
+    (6, 75.0),
+    (7, 60.0),
+    (9, 50.0),
+    (11, 40.0),
+    (15, 30.0),
+    (20, 25.0),
+    (26, 20.0),
+    (36, 15.0),
+    (46, 10.0),
+    (61, 8.0),
+    (81, 6.0),
+    (106, 5.0),
+    (161, 4.0),
+    (276, 3.0),
+    (551, 2.0),
+    (1266, 1.50),
+    (2716, 1.0),
+    (8186, 0.0)
+]
+println("Making optim data")
+# SET PARAMETER: Overlap, total entries, and samples
+data = MLBTournyOptimData(slate, payoffs, 7, 8186, 1)
+println("Reading submitted lineups")
+header, submitted = read_lineups("./mlb_lineups.csv")
+println("Swapping lineups")
+swapped = late_swap(data, header, submitted, locked_games; submitted_players=submitted_players)
+println("Writing lineups")
+games = player_games(slate, submitted_players)
+write_swapped_lineups("./mlb_lineups_swap.csv", header, [assign_slots(slate, header, submitted[n], swapped[n], games, locked_games) for n in 1:length(swapped)])